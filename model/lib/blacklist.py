@@ -15,83 +15,107 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 # DEALINGS IN THE SOFTWARE.
 import time
-import json
-import wandb
-import hashlib
+import xxhash
 import nimble as nb
 from typing import Union, Tuple, Callable, List
 from model.inference import Inference
 
+# Maximum number of distinct hotkeys counted per epoch for the per-hotkey summary.
+BLACKLIST_HOTKEY_LIMIT = 1024
 
-async def is_request_in_cache(self, synapse: Inference) -> bool:
-    # Hashes request
+
+def _hash_messages(messages: List[str]) -> int:
+    # Serializes and hashes in one pass. The cache only deduplicates honest retries,
+    # so a fast non-cryptographic 64 bit hash is enough and is used as the key directly.
+    # Length-prefix every message so that [] and [""], or ["a\x00b"] and ["a", "b"], differ.
+    encoded = (message.encode("utf-8") for message in messages)
+    request = b"".join(len(data).to_bytes(8, "little") + data for data in encoded)
+    return xxhash.xxh3_64_intdigest(request)
+
+
+def is_request_in_cache(self, synapse: Inference) -> bool:
+    # Hashes request outside of the lock, only the cache itself needs guarding.
     # Note: Could be improved using a similarity check
-    async with self.lock:
-        request = json.dumps(list(synapse.messages))
-        request_key = hashlib.sha256(request.encode()).hexdigest()
-        current_block = self.metagraph.block
+    request_key = _hash_messages(synapse.messages)
+
+    # metagraph.block is a tensor, read it once as a plain int so the cache
+    # stores and compares ints rather than tensors.
+    current_block = int(self.metagraph.block)
 
+    with self.lock:
         should_blacklist: bool
         # Check if request is in cache, if not add it
         if request_key in self.request_cache:
             should_blacklist = True
         else:
-            caller_hotkey = synapse.dendrite.hotkey
             self.request_cache[request_key] = current_block
+            self.request_expiry.append((current_block, request_key))
             should_blacklist = False
 
-        # Sanitize cache by removing old entries according to block span
-        keys_to_remove = []
-        for key, block in self.request_cache.items():
-            if (
-                block + self.config.miner.blacklist.request_cache_block_span
-                < current_block
-            ):
-                keys_to_remove.append(key)
+    return should_blacklist
 
-        for key in keys_to_remove:
-            del self.request_cache[key]
 
-    return should_blacklist
+def evict_request_cache(self, current_block: int):
+    # Sanitize cache by removing old entries according to block span.
+    # Entries are queued in block order, so only the expired head is visited.
+    span = self._bl_cache_span
+    with self.lock:
+        while self.request_expiry and self.request_expiry[0][0] + span < current_block:
+            _, key = self.request_expiry.popleft()
+            self.request_cache.pop(key, None)
 
 
-def default_blacklist(self, synapse: Inference) -> Union[Tuple[bool, str], bool]:
+def _default_blacklist(self, synapse: Inference) -> Tuple[bool, str, str]:
+    # Returns the decision, its reason and a fixed category used for wandb metrics.
+    hotkey = synapse.dendrite.hotkey
+
     # Check if the key is white listed.
-    if synapse.dendrite.hotkey in self.config.miner.blacklist.whitelist:
-        return False, "whitelisted hotkey"
+    if hotkey in self._bl_whitelist:
+        return False, "whitelisted hotkey", "whitelisted"
 
     # Check if the key is black listed.
-    if synapse.dendrite.hotkey in self.config.miner.blacklist.blacklist:
-        return True, "blacklisted hotkey"
+    if hotkey in self._bl_blacklist:
+        return True, "blacklisted hotkey", "blacklisted"
+
+    uid = self._hotkey_to_uid.get(hotkey)
 
     # Check registration if we do not allow non-registered users
     if (
-        not self.config.miner.blacklist.allow_non_registered
+        not self._bl_allow_nonreg
         and self.metagraph is not None
-        and synapse.dendrite.hotkey not in self.metagraph.hotkeys
+        and uid is None
     ):
-        return True, "hotkey not registered"
+        return True, "hotkey not registered", "not_registered"
 
     # Check if the key has validator permit
-    if self.config.miner.blacklist.force_validator_permit:
-        if synapse.dendrite.hotkey in self.metagraph.hotkeys:
-            uid = self.metagraph.hotkeys.index(synapse.dendrite.hotkey)
-            if not self.metagraph.validator_permit[uid]:
-                return True, "validator permit required"
-        else:
-            return True, "validator permit required, but hotkey not registered"
+    if self._bl_force_permit:
+        if uid is None:
+            return (
+                True,
+                "validator permit required, but hotkey not registered",
+                "no_permit",
+            )
+        if not self.metagraph.validator_permit[uid]:
+            return True, "validator permit required", "no_permit"
 
     # request period
-    if synapse.dendrite.hotkey in self.request_timestamps:
-        period = time.time() - self.request_timestamps[synapse.dendrite.hotkey][0]
-        if period < self.config.miner.blacklist.min_request_period * 60:
+    timestamps = self.request_timestamps.get(hotkey)
+    if timestamps is not None:
+        period = time.time() - timestamps[0]
+        if period < self._bl_min_period_s:
             return (
                 True,
-                f"{synapse.dendrite.hotkey} request frequency exceeded {len(self.request_timestamps[synapse.dendrite.hotkey])} requests in {self.config.miner.blacklist.min_request_period} minutes.",
+                f"{hotkey} request frequency exceeded {len(timestamps)} requests in {self._bl_min_period} minutes.",
+                "rate_limited",
             )
 
     # Otherwise the user is not blacklisted.
-    return False, "passed blacklist"
+    return False, "passed blacklist", "passed"
+
+
+def default_blacklist(self, synapse: Inference) -> Union[Tuple[bool, str], bool]:
+    does_blacklist, reason, _ = _default_blacklist(self, synapse)
+    return does_blacklist, reason
 
 
 def blacklist(
@@ -100,41 +124,47 @@ def blacklist(
     nb.logging.trace("run blacklist function")
 
     # First check to see if the black list function is overridden by the subclass.
-    does_blacklist = None
-    reason = None
+    blacklist_result = None
     try:
         # Run the subclass blacklist function.
         blacklist_result = func(synapse)
 
-        # Unpack result.
-        if hasattr(blacklist_result, "__len__"):
-            does_blacklist, reason = blacklist_result
-        else:
-            does_blacklist = blacklist_result
-            reason = "no reason provided"
-
     except NotImplementedError:
         # The subclass did not override the blacklist function.
-        does_blacklist, reason = default_blacklist(self, synapse)
+        pass
 
     except Exception as e:
         # There was an error in their blacklist function.
         nb.logging.error(f"Error in blacklist function: {e}")
-        does_blacklist, reason = default_blacklist(self, synapse)
-
-    finally:
-        # If the blacklist function returned None, we use the default blacklist.
-        if does_blacklist == None:
-            does_blacklist, reason = default_blacklist(self, synapse)
-
-        # Finally, log and return the blacklist result.
-        nb.logging.trace(f"blacklisted: {does_blacklist}, reason: {reason}")
-        if does_blacklist and self.config.wandb.on:
-            wandb.log(
-                {
-                    "blacklisted": float(does_blacklist),
-                    "return_message": reason,
-                    "hotkey": synapse.dendrite.hotkey,
-                }
-            )
-        return does_blacklist, reason
+
+    # Unpack result, subclass decisions are counted without parsing their reason.
+    does_blacklist = None
+    reason = None
+    category = "other"
+    if isinstance(blacklist_result, (tuple, list)):
+        try:
+            does_blacklist, reason = blacklist_result
+        except (TypeError, ValueError) as e:
+            nb.logging.error(f"Invalid result from blacklist function: {e}")
+    elif blacklist_result is not None:
+        does_blacklist = blacklist_result
+        reason = "no reason provided"
+
+    # If the blacklist function was not implemented, failed or returned None, we use the default blacklist.
+    if does_blacklist is None:
+        does_blacklist, reason, category = _default_blacklist(self, synapse)
+    does_blacklist = bool(does_blacklist)
+
+    # Finally, log and return the blacklist result.
+    nb.logging.trace(f"blacklisted: {does_blacklist}, reason: {reason}")
+    if does_blacklist and self.config.wandb.on:
+        # Aggregate rejections, run() logs the counts once per epoch.
+        hotkey = synapse.dendrite.hotkey
+        with self._bl_counter_lock:
+            self._bl_counter[category] += 1
+            if (
+                hotkey in self._bl_hotkey_counter
+                or len(self._bl_hotkey_counter) < BLACKLIST_HOTKEY_LIMIT
+            ):
+                self._bl_hotkey_counter[hotkey] += 1
+    return does_blacklist, reason
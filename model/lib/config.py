@@ -98,7 +98,7 @@ def get_config() -> "nb.Config":
     # Run config.
     parser.add_argument(
         "--miner.blocks_per_epoch",
-        type=str,
+        type=int,
         help="Blocks until the miner sets weights on chain",
         default=100,
     )
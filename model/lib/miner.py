@@ -16,8 +16,8 @@
 # DEALINGS IN THE SOFTWARE.
 
 import copy
+import collections
 import wandb
-import asyncio
 import argparse
 import threading
 
@@ -52,14 +52,29 @@ class Miner(ABC):
             nbnetwork: Nimble Subtensor object which manages the blockchain connection.
         """
         # Setup base config from Miner.config() and merge with subclassed config.
-        base_config = copy.deepcopy(config or get_config())
+        # merge() shares nested values with self.config, which is modified below, so only
+        # a caller supplied config needs copying; a fresh get_config() is ours to keep.
+        base_config = copy.deepcopy(config) if config else get_config()
         self.config = self.config()
         self.config.merge(base_config)
 
         check_config(Miner, self.config)
         nb.logging.info(self.config)  # TODO: duplicate print?
 
-        self.request_cache: Dict[str, Tuple[str, int]] = {}
+        # Hashed views of the hotkey lists for constant time membership checks.
+        self._bl_whitelist = frozenset(self.config.miner.blacklist.whitelist or ())
+        self._bl_blacklist = frozenset(self.config.miner.blacklist.blacklist or ())
+
+        # Blacklist settings read on every request, bound once to skip the config lookups.
+        self._bl_allow_nonreg = self.config.miner.blacklist.allow_non_registered
+        self._bl_force_permit = self.config.miner.blacklist.force_validator_permit
+        self._bl_min_period = self.config.miner.blacklist.min_request_period
+        self._bl_min_period_s = self._bl_min_period * 60.0
+        self._bl_cache_span = self.config.miner.blacklist.request_cache_block_span
+        self._bl_use_cache = self.config.miner.blacklist.use_request_cache
+
+        self.request_cache: Dict[int, int] = {}
+        self.request_expiry: "collections.deque[Tuple[int, int]]" = collections.deque()
 
         # Activating Nimble's logging with the set configurations.
         nb.logging(config=self.config, logging_dir=self.config.full_path)
@@ -89,6 +104,10 @@ class Miner(ABC):
         # metagraph provides the network's current state, holding state about other participants in a subnet.
         self.metagraph = self.nbnetwork.metagraph(self.config.netuid)
         nb.logging.info(f"Metagraph: {self.metagraph}")
+        # Hotkey to uid index, rebuilt whenever the metagraph is refreshed.
+        self._hotkey_to_uid: Dict[str, int] = {
+            hotkey: uid for uid, hotkey in enumerate(self.metagraph.hotkeys)
+        }
 
         if self.wallet.hotkey.ss58_address not in self.metagraph.hotkeys:
             nb.logging.error(
@@ -129,12 +148,19 @@ class Miner(ABC):
                 tags=tags,
             )
 
+        # Blacklist rejections counted by reason category and by (a bounded set of) hotkeys,
+        # flushed to wandb once per epoch by run().
+        self._bl_counter: collections.Counter = collections.Counter()
+        self._bl_hotkey_counter: collections.Counter = collections.Counter()
+        self._bl_counter_lock = threading.Lock()
+
         # Instantiate runners
+        self.exit_event: threading.Event = threading.Event()
         self.should_exit: bool = False
         self.is_running: bool = False
         self.thread: threading.Thread = None
-        self.lock = asyncio.Lock()
-        self.request_timestamps: Dict = {}
+        self.lock = threading.Lock()
+        self.request_timestamps: Dict[str, "collections.deque[float]"] = {}
 
     @abstractmethod
     def config(self) -> "nb.Config":
@@ -189,10 +215,10 @@ class Miner(ABC):
             This method is not meant to be called directly but is invoked internally when a request
             is received, and it subsequently calls the `request` method of the subclass.
         """
-        if self.config.miner.blacklist.use_request_cache:
+        if self._bl_use_cache:
             if is_request_in_cache(self, synapse):
                 raise ValueError(
-                    f"Blacklisted: Request sent recently in last {self.config.miner.blacklist.request_cache_block_span} blocks."
+                    f"Blacklisted: Request sent recently in last {self._bl_cache_span} blocks."
                 )
         return self.predict(synapse)
 
@@ -268,6 +294,21 @@ class Miner(ABC):
 
         return priority(self, _priority, synapse)
 
+    @property
+    def should_exit(self) -> bool:
+        """
+        Whether the miner's run loop should stop. Backed by `exit_event` so that setting it
+        wakes the run loop immediately instead of after its current wait.
+        """
+        return self.exit_event.is_set()
+
+    @should_exit.setter
+    def should_exit(self, value: bool):
+        if value:
+            self.exit_event.set()
+        else:
+            self.exit_event.clear()
+
     def run(self):
         """
         Runs the miner logic. This method starts the miner's operations, including
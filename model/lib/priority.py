@@ -18,35 +18,35 @@
 import time
 import nimble as nb
 
+from collections import deque
+
 from model.inference import Inference
 from typing import List, Dict, Callable
 
 
 def record_request_timestamps(self, synapse: Inference):
-    timestamp_length = self.config.miner.priority.len_request_timestamps
-    if synapse.dendrite.hotkey not in self.request_timestamps:
-        self.request_timestamps[synapse.dendrite.hotkey] = [0] * timestamp_length
+    timestamps = self.request_timestamps.get(synapse.dendrite.hotkey)
+    if timestamps is None:
+        # Bounded ring buffer, the oldest timestamp falls off on append.
+        timestamp_length = self.config.miner.priority.len_request_timestamps
+        timestamps = deque([0] * timestamp_length, maxlen=timestamp_length)
+        self.request_timestamps[synapse.dendrite.hotkey] = timestamps
 
-    self.request_timestamps[synapse.dendrite.hotkey].append(time.time())
-    self.request_timestamps[synapse.dendrite.hotkey] = self.request_timestamps[
-        synapse.dendrite.hotkey
-    ][-timestamp_length:]
+    timestamps.append(time.time())
 
     return self.request_timestamps
 
 
 def default_priority(self, synapse: Inference) -> float:
-    # Check if the key is registered.
-    registered = False
+    # Check if the key is registered, registered users have a UID.
+    uid = None
     if self.metagraph is not None:
-        registered = synapse.dendrite.hotkey in self.metagraph.hotkeys
+        uid = self._hotkey_to_uid.get(synapse.dendrite.hotkey)
 
     # Non-registered users have a default priority.
-    if not registered:
+    if uid is None:
         return self.config.miner.priority.default
 
-    # If the user is registered, it has a UID.
-    uid = self.metagraph.hotkeys.index(synapse.dendrite.hotkey)
     stake_amount = self.metagraph.S[uid].item()
 
     # request period
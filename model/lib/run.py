@@ -16,10 +16,15 @@
 # DEALINGS IN THE SOFTWARE.
 import time
 import wandb
+import collections
 import nimble as nb
 import traceback
 from model.inference import Inference
 from .set_weights import set_weights
+from .blacklist import evict_request_cache
+
+# Approximate time (in seconds) between two blocks on chain.
+BLOCK_TIME = 12
 
 
 def run(self):
@@ -86,22 +91,27 @@ def run(self):
                 current_block - self.last_epoch_block
                 < self.config.miner.blocks_per_epoch
             ):
-                # --- Wait for next bloc.
-                time.sleep(1)
-                current_block = self.nbnetwork.get_current_block()
-
-                # --- Check if we should exit.
-                if self.should_exit:
+                # --- Wait for next block, waking up early if we should exit.
+                if self.exit_event.wait(BLOCK_TIME):
                     break
+                current_block = self.nbnetwork.get_current_block()
 
             # --- Update the metagraph with the latest network state.
-            self.last_epoch_block = self.nbnetwork.get_current_block()
+            self.last_epoch_block = current_block
 
-            metagraph = self.nbnetwork.metagraph(
-                netuid=self.config.netuid,
+            hotkeys = list(self.metagraph.hotkeys)
+            self.metagraph.sync(
+                block=current_block,
                 lite=True,
-                block=self.last_epoch_block,
+                nbnetwork=self.nbnetwork,
             )
+            metagraph = self.metagraph
+
+            # --- Rebuild the hotkey index only when subnet membership changed.
+            if metagraph.hotkeys != hotkeys:
+                self._hotkey_to_uid = {
+                    hotkey: uid for uid, hotkey in enumerate(metagraph.hotkeys)
+                }
             log = (
                 f"Step:{step} | "
                 f"Block:{metagraph.block.item()} | "
@@ -114,7 +124,27 @@ def run(self):
             )
             nb.logging.info(log)
             if self.config.wandb.on:
-                wandb.log(log)
+                wandb.log({"log": log})
+
+                # --- Flush the blacklist counts aggregated during this epoch.
+                with self._bl_counter_lock:
+                    counts, self._bl_counter = self._bl_counter, collections.Counter()
+                    hotkey_counts = self._bl_hotkey_counter
+                    self._bl_hotkey_counter = collections.Counter()
+                if counts:
+                    event = {
+                        f"blacklist/{category}": count
+                        for category, count in counts.items()
+                    }
+                    event["blacklist/top_hotkeys"] = wandb.Table(
+                        columns=["hotkey", "count"],
+                        data=[list(item) for item in hotkey_counts.most_common(10)],
+                    )
+                    wandb.log(event)
+
+            # --- Drop expired requests from the cache, off the request path.
+            if self._bl_use_cache:
+                evict_request_cache(self, current_block)
 
             # --- Set weights.
             if not self.config.miner.no_set_weights: